@@ -62,7 +62,7 @@ print(f"[OK] Key sections found: {key_count}")
 
 # Load existing database
 toc_db_path = Path(__file__).parent.parent / "outputs" / "exploration" / "toc_database.json"
-with open(toc_db_path, 'r') as f:
+with open(toc_db_path, 'r', encoding='utf-8') as f:
     toc_db = json.load(f)
 
 print(f"\n[OK] Loaded existing database: {len(toc_db)} wells")
@@ -81,7 +81,7 @@ toc_db[well_key] = {
 }
 
 # Save updated database
-with open(toc_db_path, 'w') as f:
+with open(toc_db_path, 'w', encoding='utf-8') as f:
     json.dump(toc_db, f, indent=2)
 
 print(f"\n[OK] Added '{well_key}' to TOC database")
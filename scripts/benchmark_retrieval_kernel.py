@@ -0,0 +1,115 @@
+"""
+Retrieval kernel benchmark: brute-force NumPy search vs ChromaDB query
+
+Pulls every stored embedding once, then times an exact dot-product sweep
+(BLAS SGEMM + argpartition top-k) against ChromaDB's HNSW query for the
+same queries. The brute-force time is a lower bound for the pure distance
+cost; if ChromaDB is >10x slower, the gap is index/HTTP/Python overhead.
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import numpy as np
+from vector_store import TOCEnhancedVectorStore, _normalize
+
+N_QUERIES = int(os.getenv('KERNEL_BENCH_QUERIES', 1000))
+N_CHROMA_QUERIES = 50  # ChromaDB round-trips are slow, sample fewer
+CONCURRENCY = int(os.getenv('KERNEL_BENCH_CONCURRENCY', 1))  # Parallel ChromaDB queries
+TOP_K = 5
+
+print("="*80)
+print("RETRIEVAL KERNEL BENCHMARK")
+print("="*80)
+
+store = TOCEnhancedVectorStore(
+    collection_name="well_reports",
+    chroma_host=os.getenv('CHROMA_HOST', 'localhost'),
+    chroma_port=int(os.getenv('CHROMA_PORT', 8000))
+)
+
+# Pull the whole collection once
+start = time.perf_counter()
+data = store.collection.get(include=['embeddings'])
+db = _normalize(data['embeddings'])
+load_time = time.perf_counter() - start
+
+if db.shape[0] == 0 or db.shape[1] == 0:
+    print("\n[!] Collection is empty - index some wells first")
+    sys.exit(0)
+
+n_docs, dim = db.shape
+print(f"\n[LOAD] {n_docs} embeddings x {dim} dims in {load_time:.2f}s")
+
+# Queries: perturbed copies of stored vectors (realistic neighbourhoods)
+rng = np.random.default_rng(0)
+queries = db[rng.integers(0, n_docs, N_QUERIES)]
+queries = _normalize(queries + rng.normal(0, 0.05, queries.shape).astype(np.float32))
+
+# NumPy / BLAS sweep
+start = time.perf_counter()
+scores = queries @ db.T
+matmul_time = time.perf_counter() - start
+
+k = min(TOP_K, n_docs - 1)
+start = time.perf_counter()
+top_k = np.argpartition(-scores, k, axis=1)[:, :TOP_K]
+topk_time = time.perf_counter() - start
+
+flops = 2.0 * N_QUERIES * n_docs * dim
+bytes_read = db.nbytes + queries.nbytes
+numpy_per_query = (matmul_time + topk_time) / N_QUERIES
+
+print(f"\n[NUMPY] {N_QUERIES} queries")
+print(f"  matmul: {matmul_time*1000:.2f} ms ({flops/matmul_time/1e9:.1f} GFLOP/s, {bytes_read/matmul_time/1e9:.2f} GB/s)")
+print(f"  top-{TOP_K}: {topk_time*1000:.2f} ms")
+print(f"  per query: {numpy_per_query*1e6:.1f} us")
+
+# Optional SimSIMD cosine kernel
+try:
+    import simsimd
+    start = time.perf_counter()
+    simsimd.cdist(queries, db, metric='cos')
+    simsimd_time = time.perf_counter() - start
+    print(f"\n[SIMSIMD] cdist(cos): {simsimd_time*1000:.2f} ms ({simsimd_time/N_QUERIES*1e6:.1f} us/query)")
+except ImportError:
+    print("\n[INFO] simsimd not installed - skipping SimSIMD kernel")
+
+# ChromaDB HNSW query for comparison
+def timed_query(q):
+    """Run one ChromaDB query and return its own latency"""
+    start = time.perf_counter()
+    store.query_all_wells(q, n_results=TOP_K)
+    return time.perf_counter() - start
+
+
+sample = queries[:N_CHROMA_QUERIES]
+wall_start = time.perf_counter()
+if CONCURRENCY > 1:
+    # HTTP calls release the GIL; each thread still times only its own query
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as executor:
+        latencies = np.fromiter(executor.map(timed_query, sample), dtype=np.float64, count=len(sample))
+else:
+    latencies = np.fromiter((timed_query(q) for q in sample), dtype=np.float64, count=len(sample))
+wall_time = time.perf_counter() - wall_start
+
+# All latency stats from one array
+latencies_ms = latencies * 1000
+chroma_per_query = latencies.mean()
+p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+
+print(f"\n[CHROMA] {len(sample)} single queries (concurrency={CONCURRENCY})")
+print(f"  mean: {latencies_ms.mean():.2f} ms | std: {latencies_ms.std(ddof=1):.2f} ms")
+print(f"  p50: {p50:.2f} ms | p95: {p95:.2f} ms | p99: {p99:.2f} ms")
+print(f"  wall time: {wall_time:.2f}s ({len(sample)/wall_time:.1f} queries/s)")
+
+ratio = chroma_per_query / numpy_per_query
+print("\n" + "="*80)
+print(f"ChromaDB / brute-force ratio: {ratio:.0f}x")
+if ratio > 10:
+    print("  [!] Retrieval time is dominated by index/HTTP/Python overhead, not distance math")
+print("="*80)
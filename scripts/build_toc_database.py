@@ -1,14 +1,26 @@
 """Build TOC Database for All Wells with Smart PDF Routing"""
+import os
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import fitz  # PyMuPDF
-from docling.document_converter import DocumentConverter
+from docling.document_converter import DocumentConverter, PdfFormatOption
+from docling.datamodel.pipeline_options import PdfPipelineOptions
+from docling.datamodel.base_models import InputFormat, DocumentStream
+from io import BytesIO
 import re
 import datetime
 import json
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+# Optional: orjson is faster than stdlib json (falls back if not installed)
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 print("="*80)
 print("TOC DATABASE BUILDER")
@@ -43,76 +55,65 @@ def is_scanned_pdf(pdf_path):
 # PHASE 2: SMART PDF PARSING
 # ============================================================================
 
+@lru_cache(maxsize=2)
+def get_converter(do_ocr):
+    """
+    Shared Docling converter (one per OCR mode)
+    Models are loaded once and reused for every EOWR file in the run
+    """
+    pipeline_options = PdfPipelineOptions()
+    pipeline_options.do_ocr = do_ocr
+    pipeline_options.do_table_structure = True
+
+    return DocumentConverter(
+        format_options={
+            InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)
+        }
+    )
+
+
 def parse_first_4_pages_smart(pdf_path):
     """
     OPTIMIZED: Extract first 4 pages with PyMuPDF, then process with Docling
     Returns: (text, method, is_scanned)
     """
-    from docling.datamodel.pipeline_options import PdfPipelineOptions
-    from docling.datamodel.base_models import InputFormat
-    from docling.document_converter import PdfFormatOption
-    import tempfile
-    import os
-
     # Step 1: Quick scan detection
     is_scanned = is_scanned_pdf(pdf_path)
 
-    # Step 2: Extract first 4 pages to temporary PDF
+    # Step 2: Extract first 4 pages to an in-memory PDF
     try:
         doc = fitz.open(str(pdf_path))
         num_pages = min(4, len(doc))
 
-        # Create temp PDF with first 4 pages only
-        temp_pdf = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
-        temp_path = temp_pdf.name
-        temp_pdf.close()
-
-        # Create new PDF with first 4 pages
+        # Create new PDF with first 4 pages only
         new_doc = fitz.open()
         for i in range(num_pages):
             new_doc.insert_pdf(doc, from_page=i, to_page=i)
-        new_doc.save(temp_path)
+        pdf_bytes = new_doc.tobytes()
         new_doc.close()
         doc.close()
 
-        print(f"    [EXTRACTED] First {num_pages} pages to temp PDF")
+        print(f"    [EXTRACTED] First {num_pages} pages to in-memory PDF")
     except Exception as e:
         print(f"    [ERROR] Failed to extract pages: {e}")
         return "", 'error', is_scanned
 
-    # Step 3: Process temp PDF with Docling
+    # Step 3: Process extracted pages with Docling
     if is_scanned:
         print(f"    [SCANNED] Using Docling with OCR")
-        pipeline_options = PdfPipelineOptions()
-        pipeline_options.do_ocr = True
-        pipeline_options.do_table_structure = True
     else:
         print(f"    [NATIVE] Using Docling without OCR")
-        pipeline_options = PdfPipelineOptions()
-        pipeline_options.do_ocr = False
-        pipeline_options.do_table_structure = True
 
     try:
-        converter = DocumentConverter(
-            format_options={
-                InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)
-            }
-        )
-        result = converter.convert(temp_path)
+        converter = get_converter(is_scanned)
+        source = DocumentStream(name=Path(pdf_path).name, stream=BytesIO(pdf_bytes))
+        result = converter.convert(source)
         full_text = result.document.export_to_markdown()
         method = 'ocr' if is_scanned else 'fast_native'
 
-        # Clean up temp file
-        os.unlink(temp_path)
-
         return full_text, method, is_scanned
     except Exception as e:
         print(f"    [ERROR] Docling failed: {e}")
-        # Clean up temp file
-        try:
-            os.unlink(temp_path)
-        except:
-            pass
         return "", 'error', is_scanned
 
 
@@ -408,26 +409,37 @@ def extract_toc_flexible(text):
 # PHASE 4: PUBLICATION DATE EXTRACTION
 # ============================================================================
 
+# Lines mentioning any of these are searched for dates. One compiled
+# alternation scans each line once instead of once per keyword.
+DATE_CONTEXT_KEYWORDS = [
+    'publication date', 'date', 'published', 'issue date',
+    'report date', 'approved', 'version', 'revision date'
+]
+_DATE_CONTEXT_RE = re.compile('|'.join(map(re.escape, DATE_CONTEXT_KEYWORDS)), re.IGNORECASE)
+
+_MONTH_YEAR_RE = re.compile(
+    r'\b((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*)\s*[/\-]?\s*((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*)?\s*(\d{4})\b',
+    re.IGNORECASE
+)
+_FULL_DATE_RES = [
+    re.compile(r'\b(\d{1,2}[-/.]\d{1,2}[-/.]\d{4})\b', re.IGNORECASE),
+    re.compile(r'\b(\d{4}[-/.]\d{1,2}[-/.]\d{1,2})\b', re.IGNORECASE),
+    re.compile(r'\b(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4})\b', re.IGNORECASE),
+]
+
+
 def extract_publication_date(text):
     """Extract publication date using context-aware search"""
-    context_keywords = [
-        'publication date', 'date', 'published', 'issue date',
-        'report date', 'approved', 'version', 'revision date'
-    ]
-
     lines = text.split('\n')
     found_dates = []
 
     for i, line in enumerate(lines):
-        line_lower = line.lower()
-
-        if any(keyword in line_lower for keyword in context_keywords):
+        if _DATE_CONTEXT_RE.search(line):
             # Search this line + next 2 lines
             search_text = ' '.join(lines[i:i+3])
 
             # Pattern 1: Month/Year
-            month_year_pattern = r'\b((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*)\s*[/\-]?\s*((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*)?\s*(\d{4})\b'
-            matches = re.findall(month_year_pattern, search_text, re.IGNORECASE)
+            matches = _MONTH_YEAR_RE.findall(search_text)
             for match in matches:
                 try:
                     month = match[1] if match[1] else match[0]
@@ -446,14 +458,8 @@ def extract_publication_date(text):
                         continue
 
             # Pattern 2: Full dates
-            date_patterns = [
-                r'\b(\d{1,2}[-/.]\d{1,2}[-/.]\d{4})\b',
-                r'\b(\d{4}[-/.]\d{1,2}[-/.]\d{1,2})\b',
-                r'\b(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4})\b',
-            ]
-
-            for pattern in date_patterns:
-                matches = re.findall(pattern, search_text, re.IGNORECASE)
+            for pattern in _FULL_DATE_RES:
+                matches = pattern.findall(search_text)
                 for match in matches:
                     for fmt in ['%d-%m-%Y', '%d.%m.%Y', '%d/%m/%Y', '%Y-%m-%d', '%Y/%m/%d', '%d %B %Y', '%d %b %Y']:
                         try:
@@ -559,95 +565,119 @@ def identify_key_sections(toc):
     return key_sections
 
 
-def build_toc_database(data_dir):
-    """Main function - orchestrate all phases"""
-    print("\n" + "#"*80)
-    print("# PHASE 1: SCANNING FOR EOWR FILES")
-    print("#"*80)
+def analyze_well(job):
+    """
+    Parse all EOWR candidates of one well and pick the best one
+    Runs standalone so wells can be processed in worker processes
+    Returns: (well_name, toc_entry or None)
+    """
+    well_name, eowr_files = job
 
-    all_eowr = scan_all_eowr_files(data_dir)
+    print(f"\n{'='*80}")
+    print(f"{well_name}: {len(eowr_files)} EOWR file(s)")
+    print(f"{'='*80}")
 
-    total_files = sum(len(files) for files in all_eowr.values())
-    print(f"\nFound {total_files} EOWR files across {len(all_eowr)} wells")
+    candidates = []
 
-    print("\n" + "#"*80)
-    print("# PHASE 2-4: PARSING AND ANALYSIS")
-    print("#"*80)
+    for eowr_file in eowr_files:
+        print(f"\n  Analyzing: {eowr_file.name}")
 
-    toc_database = {}
+        # Parse first 4 pages (smart routing)
+        text, method, is_scanned = parse_first_4_pages_smart(eowr_file)
 
-    for well_name, eowr_files in all_eowr.items():
-        if not eowr_files:
+        if not text:
+            print(f"    [SKIP] Failed to parse")
             continue
 
-        print(f"\n{'='*80}")
-        print(f"{well_name}: {len(eowr_files)} EOWR file(s)")
-        print(f"{'='*80}")
+        # Extract TOC
+        toc = extract_toc_flexible(text)
 
-        candidates = []
-
-        for eowr_file in eowr_files:
-            print(f"\n  Analyzing: {eowr_file.name}")
-
-            # Parse first 4 pages (smart routing)
-            text, method, is_scanned = parse_first_4_pages_smart(eowr_file)
+        # Extract publication date
+        pub_date = extract_publication_date(text)
+        if pub_date:
+            print(f"    [DATE] {pub_date.strftime('%Y-%m-%d')}")
+        else:
+            print(f"    [DATE] Not found")
+
+        # Get file size
+        file_size = eowr_file.stat().st_size
+
+        candidates.append({
+            'file': eowr_file,
+            'filename': eowr_file.name,
+            'file_size': file_size,
+            'is_scanned': is_scanned,
+            'parse_method': method,
+            'toc': toc,
+            'pub_date': pub_date,
+            'text_preview': text[:500]
+        })
+
+    if not candidates:
+        return well_name, None
+
+    # Select best EOWR
+    best = select_best_eowr(candidates)
+
+    print(f"\n  [SELECTED] {best['filename']}")
+    print(f"    - TOC entries: {len(best['toc'])}")
+    print(f"    - Publication date: {best['pub_date'].strftime('%Y-%m-%d') if best['pub_date'] else 'N/A'}")
+    print(f"    - File size: {best['file_size']/1024/1024:.1f} MB")
+    print(f"    - Scanned: {'Yes' if best['is_scanned'] else 'No'}")
+
+    # Identify key sections
+    key_sections = identify_key_sections(best['toc']) if best['toc'] else {}
+
+    # Count key sections found
+    key_count = sum(len(v) for v in key_sections.values())
+    if key_count > 0:
+        print(f"    - Key sections found: {key_count}")
+
+    return well_name, {
+        'eowr_file': str(best['file']),
+        'filename': best['filename'],
+        'file_size': best['file_size'],
+        'pub_date': best['pub_date'].isoformat() if best['pub_date'] else None,
+        'is_scanned': best['is_scanned'],
+        'parse_method': best['parse_method'],
+        'toc': best['toc'],
+        'key_sections': key_sections
+    }
 
-            if not text:
-                print(f"    [SKIP] Failed to parse")
-                continue
 
-            # Extract TOC
-            toc = extract_toc_flexible(text)
+def build_toc_database(data_dir, workers=1):
+    """
+    Main function - orchestrate all phases
 
-            # Extract publication date
-            pub_date = extract_publication_date(text)
-            if pub_date:
-                print(f"    [DATE] {pub_date.strftime('%Y-%m-%d')}")
-            else:
-                print(f"    [DATE] Not found")
+    Wells are independent, so with workers > 1 they are analyzed in a
+    process pool (each worker loads its own Docling models once)
+    """
+    print("\n" + "#"*80)
+    print("# PHASE 1: SCANNING FOR EOWR FILES")
+    print("#"*80)
 
-            # Get file size
-            file_size = eowr_file.stat().st_size
+    all_eowr = scan_all_eowr_files(data_dir)
 
-            candidates.append({
-                'file': eowr_file,
-                'filename': eowr_file.name,
-                'file_size': file_size,
-                'is_scanned': is_scanned,
-                'parse_method': method,
-                'toc': toc,
-                'pub_date': pub_date,
-                'text_preview': text[:500]
-            })
+    total_files = sum(len(files) for files in all_eowr.values())
+    print(f"\nFound {total_files} EOWR files across {len(all_eowr)} wells")
 
-        # Select best EOWR
-        if candidates:
-            best = select_best_eowr(candidates)
+    print("\n" + "#"*80)
+    print(f"# PHASE 2-4: PARSING AND ANALYSIS ({workers} worker(s))")
+    print("#"*80)
 
-            print(f"\n  [SELECTED] {best['filename']}")
-            print(f"    - TOC entries: {len(best['toc'])}")
-            print(f"    - Publication date: {best['pub_date'].strftime('%Y-%m-%d') if best['pub_date'] else 'N/A'}")
-            print(f"    - File size: {best['file_size']/1024/1024:.1f} MB")
-            print(f"    - Scanned: {'Yes' if best['is_scanned'] else 'No'}")
+    jobs = [(well_name, eowr_files) for well_name, eowr_files in all_eowr.items() if eowr_files]
 
-            # Identify key sections
-            key_sections = identify_key_sections(best['toc']) if best['toc'] else {}
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            results = list(executor.map(analyze_well, jobs))
+    else:
+        results = [analyze_well(job) for job in jobs]
 
-            # Count key sections found
-            key_count = sum(len(v) for v in key_sections.values())
-            if key_count > 0:
-                print(f"    - Key sections found: {key_count}")
-
-            toc_database[well_name] = {
-                'eowr_file': str(best['file']),
-                'filename': best['filename'],
-                'file_size': best['file_size'],
-                'pub_date': best['pub_date'].isoformat() if best['pub_date'] else None,
-                'is_scanned': best['is_scanned'],
-                'parse_method': best['parse_method'],
-                'toc': best['toc'],
-                'key_sections': key_sections
-            }
+    # executor.map preserves job order, so the database keeps well order
+    toc_database = {}
+    for well_name, entry in results:
+        if entry is not None:
+            toc_database[well_name] = entry
 
     return toc_database
 
@@ -719,15 +749,22 @@ def generate_report(toc_database):
 if __name__ == '__main__':
     data_dir = Path(__file__).parent.parent / "Training data-shared with participants"
 
+    # Number of wells to analyze in parallel (each worker loads its own models)
+    workers = int(os.getenv('TOC_BUILD_WORKERS', 1))
+
     # Build database
-    toc_db = build_toc_database(data_dir)
+    toc_db = build_toc_database(data_dir, workers=workers)
 
     # Save JSON
     output_json = Path(__file__).parent.parent / 'outputs' / 'exploration' / 'toc_database.json'
     output_json.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_json, 'w') as f:
-        json.dump(toc_db, f, indent=2, default=str)
+    if orjson is not None:
+        # Written as UTF-8 (non-ASCII is not escaped): read it back with encoding='utf-8'
+        output_json.write_bytes(orjson.dumps(toc_db, default=str, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_json, 'w') as f:
+            json.dump(toc_db, f, indent=2, default=str)
 
     print(f"\n{'='*80}")
     print(f"[OK] Database saved to: {output_json}")
@@ -736,8 +773,7 @@ if __name__ == '__main__':
     report = generate_report(toc_db)
     output_report = Path(__file__).parent.parent / 'outputs' / 'exploration' / 'toc_database_report.md'
 
-    with open(output_report, 'w', encoding='utf-8') as f:
-        f.write(report)
+    output_report.write_text(report, encoding='utf-8')
 
     print(f"[OK] Report saved to: {output_report}")
     print("="*80)
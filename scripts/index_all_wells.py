@@ -10,6 +10,23 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 from rag_system import WellReportRAG
 import json
 import time
+from collections import Counter
+
+# Optional: orjson is faster than stdlib json (falls back if not installed)
+try:
+    import orjson
+
+    def _dump(obj, f):
+        f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+
+    def _dump_line(obj, f):
+        f.write(orjson.dumps(obj) + b'\n')
+except ImportError:
+    def _dump(obj, f):
+        f.write(json.dumps(obj, indent=2).encode('utf-8'))
+
+    def _dump_line(obj, f):
+        f.write(json.dumps(obj).encode('utf-8') + b'\n')
 
 print("="*80)
 print("INDEXING ALL WELLS")
@@ -37,7 +54,13 @@ for well in wells_to_index:
 results = {}
 total_chunks = 0
 total_pdfs = 0
-start_time = time.time()
+start_time = time.perf_counter()
+
+# Per-well results are appended as each well finishes, so an interrupted
+# run still leaves a record of what was indexed
+output_dir = Path(__file__).parent.parent / 'outputs'
+output_dir.mkdir(parents=True, exist_ok=True)
+log_file = open(output_dir / 'indexing_results.jsonl', 'ab')
 
 # Index each well
 for i, well_name in enumerate(wells_to_index, 1):
@@ -45,13 +68,13 @@ for i, well_name in enumerate(wells_to_index, 1):
     print(f"INDEXING {well_name} ({i}/{len(wells_to_index)})")
     print(f"{'='*80}")
 
-    well_start_time = time.time()
+    well_start_time = time.perf_counter()
 
     try:
         # Index this well (will handle multiple PDFs if available)
         result = rag.index_well_reports(well_name, reindex=False)
 
-        well_elapsed = time.time() - well_start_time
+        well_elapsed = time.perf_counter() - well_start_time
 
         # Track results
         results[well_name] = {
@@ -70,7 +93,7 @@ for i, well_name in enumerate(wells_to_index, 1):
         print(f"     PDFs: {result['pdfs_indexed']}, Chunks: {result['total_chunks']}")
 
     except Exception as e:
-        well_elapsed = time.time() - well_start_time
+        well_elapsed = time.perf_counter() - well_start_time
 
         print(f"\n[ERROR] Failed to index {well_name}: {e}")
 
@@ -80,8 +103,15 @@ for i, well_name in enumerate(wells_to_index, 1):
             'elapsed_seconds': round(well_elapsed, 2)
         }
 
+    _dump_line({
+        'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'well_name': well_name,
+        **results[well_name]
+    }, log_file)
+    log_file.flush()
+
     # Progress update
-    elapsed_so_far = time.time() - start_time
+    elapsed_so_far = time.perf_counter() - start_time
     avg_time_per_well = elapsed_so_far / i
     remaining_wells = len(wells_to_index) - i
     estimated_remaining = avg_time_per_well * remaining_wells
@@ -89,8 +119,10 @@ for i, well_name in enumerate(wells_to_index, 1):
     print(f"\nProgress: {i}/{len(wells_to_index)} wells ({100*i//len(wells_to_index)}%)")
     print(f"Elapsed: {elapsed_so_far/60:.1f} min | Estimated remaining: {estimated_remaining/60:.1f} min")
 
+log_file.close()
+
 # Final summary
-total_elapsed = time.time() - start_time
+total_elapsed = time.perf_counter() - start_time
 
 print("\n" + "="*80)
 print("INDEXING COMPLETE")
@@ -108,21 +140,23 @@ for well_name, result in results.items():
         print(f"  [ERROR] {well_name}: {result.get('error', 'Unknown error')}")
 
 # Save results to file
-output_file = Path(__file__).parent.parent / 'outputs' / 'indexing_results.json'
-output_file.parent.mkdir(parents=True, exist_ok=True)
+output_file = output_dir / 'indexing_results.json'
+
+# Count wells per status in one pass
+status_counts = Counter(r['status'] for r in results.values())
 
 summary = {
     'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
     'total_elapsed_minutes': round(total_elapsed / 60, 2),
     'total_pdfs_indexed': total_pdfs,
     'total_chunks_indexed': total_chunks,
-    'wells_indexed': len([r for r in results.values() if r['status'] == 'success']),
-    'wells_failed': len([r for r in results.values() if r['status'] == 'error']),
+    'wells_indexed': status_counts['success'],
+    'wells_failed': status_counts['error'],
     'results': results
 }
 
-with open(output_file, 'w') as f:
-    json.dump(summary, f, indent=2)
+with open(output_file, 'wb') as f:
+    _dump(summary, f)
 
 print(f"\n[OK] Results saved to: {output_file}")
 
@@ -18,7 +18,7 @@ print("="*80)
 
 # Load existing TOC database
 toc_db_path = Path(__file__).parent.parent / "outputs" / "exploration" / "toc_database.json"
-with open(toc_db_path, 'r') as f:
+with open(toc_db_path, 'r', encoding='utf-8') as f:
     toc_db = json.load(f)
 
 # Get all TOC-indexed filenames
@@ -6,6 +6,12 @@ Chunks text with section context for better retrieval accuracy
 from typing import List, Dict
 import re
 
+# Compiled once at import (header parsing runs for every section of every PDF)
+_SECTION_SPLIT_RE = re.compile(r'(^#{1,2}\s+.+$)', flags=re.MULTILINE)
+_HEADER_RE = re.compile(r'#{1,2}\s+(\d+\.?\d*\.?\d*)\s+(.+)')
+_HEADER_MARKUP_RE = re.compile(r'^#{1,2}\s+')
+_SECTION_NUMBER_RE = re.compile(r'^\d+\.?\d*\.?\d*\s+')
+
 
 class SectionAwareChunker:
     """
@@ -66,7 +72,7 @@ class SectionAwareChunker:
 
         # Split by markdown headers (## Section Title or # Section Title)
         # This regex captures the header and its content
-        sections = re.split(r'(^#{1,2}\s+.+$)', text, flags=re.MULTILINE)
+        sections = _SECTION_SPLIT_RE.split(text)
 
         # Process sections (header + content pairs)
         for i in range(1, len(sections), 2):
@@ -115,19 +121,20 @@ class SectionAwareChunker:
             Matching TOC entry or None
         """
         # Extract section number from header (e.g., "## 2.1 Depths" -> "2.1")
-        header_match = re.search(r'#{1,2}\s+(\d+\.?\d*\.?\d*)\s+(.+)', header)
+        header_match = _HEADER_RE.search(header)
         if not header_match:
             return None
 
         section_num = header_match.group(1)
-        header_title = header_match.group(2).strip()
+        header_title = header_match.group(2).strip().lower()
 
         # Find matching TOC entry
         for toc in toc_sections:
             if toc['number'] == section_num:
                 return toc
             # Fuzzy match on title if number doesn't match
-            if header_title.lower() in toc['title'].lower() or toc['title'].lower() in header_title.lower():
+            toc_title = toc['title'].lower()
+            if header_title in toc_title or toc_title in header_title:
                 return toc
 
         return None
@@ -135,9 +142,9 @@ class SectionAwareChunker:
     def _extract_title(self, header: str) -> str:
         """Extract title from markdown header"""
         # Remove markdown syntax (## or #)
-        title = re.sub(r'^#{1,2}\s+', '', header)
+        title = _HEADER_MARKUP_RE.sub('', header)
         # Remove section numbers
-        title = re.sub(r'^\d+\.?\d*\.?\d*\s+', '', title)
+        title = _SECTION_NUMBER_RE.sub('', title)
         return title.strip()
 
     def _split_text_with_overlap(self, text: str) -> List[str]:
@@ -3,7 +3,7 @@ Embedding Manager
 Wrapper for nomic-embed-text-v1.5 (137M params, CPU-friendly)
 """
 
-from typing import List
+from typing import List, Union
 from sentence_transformers import SentenceTransformer
 import numpy as np
 
@@ -44,12 +44,14 @@ class EmbeddingManager:
         print(f"   Dimensions: {self.dimension}")
         print(f"   Device: CPU")
 
-    def embed_text(self, text: str) -> List[float]:
+    def embed_text(self, text: str, as_numpy: bool = False) -> Union[List[float], np.ndarray]:
         """
         Embed a single text string
 
         Args:
             text: Text to embed
+            as_numpy: Return the float32 array as-is instead of a Python list
+                      (the vector store accepts arrays; skips 768 float boxings)
 
         Returns:
             Embedding vector (768 dimensions)
@@ -59,15 +61,19 @@ class EmbeddingManager:
             convert_to_numpy=True,
             show_progress_bar=False
         )
-        return embedding.tolist()
+        return embedding if as_numpy else embedding.tolist()
 
-    def embed_texts(self, texts: List[str], batch_size: int = 32) -> List[List[float]]:
+    def embed_texts(self,
+                    texts: List[str],
+                    batch_size: int = 32,
+                    as_numpy: bool = False) -> Union[List[List[float]], np.ndarray]:
         """
         Embed multiple texts efficiently
 
         Args:
             texts: List of texts to embed
             batch_size: Batch size for encoding
+            as_numpy: Return the (n, 768) float32 array instead of nested lists
 
         Returns:
             List of embedding vectors
@@ -78,7 +84,7 @@ class EmbeddingManager:
             convert_to_numpy=True,
             show_progress_bar=len(texts) > 10  # Only show for large batches
         )
-        return embeddings.tolist()
+        return embeddings if as_numpy else embeddings.tolist()
 
     def embed_chunks(self, chunks: List[dict]) -> List[dict]:
         """
@@ -92,10 +98,11 @@ class EmbeddingManager:
                 }, ...]
 
         Returns:
-            List of chunks with added 'embedding' field
+            List of chunks with added 'embedding' field (float32 NumPy row)
         """
         texts = [chunk['text'] for chunk in chunks]
-        embeddings = self.embed_texts(texts)
+        # Rows of the float32 array (add_documents stacks them straight back)
+        embeddings = self.embed_texts(texts, as_numpy=True)
 
         # Add embeddings to chunks
         for chunk, embedding in zip(chunks, embeddings):
@@ -69,6 +69,13 @@ class QueryIntentMapper:
             'reservoir': ['technical_summary'],
         }
 
+        # Keywords longest first (multi-word phrases before their parts),
+        # paired with their sections - computed once instead of per query
+        self._sorted_keywords = tuple(
+            (keyword, tuple(self.keyword_to_section[keyword]))
+            for keyword in sorted(self.keyword_to_section, key=len, reverse=True)
+        )
+
         # Section type descriptions (for logging/debugging)
         self.section_descriptions = {
             'casing': 'Casing and tubing specifications (ID, OD, depth)',
@@ -99,12 +106,8 @@ class QueryIntentMapper:
         matched_keywords = []
 
         # Match keywords (longest first to handle multi-word phrases)
-        sorted_keywords = sorted(self.keyword_to_section.keys(),
-                                 key=len, reverse=True)
-
-        for keyword in sorted_keywords:
+        for keyword, sections in self._sorted_keywords:
             if keyword in query_lower:
-                sections = self.keyword_to_section[keyword]
                 section_types.extend(sections)
                 matched_keywords.append(keyword)
 
@@ -153,12 +156,8 @@ class QueryIntentMapper:
 
         # Find matched keywords
         query_lower = query.lower()
-        matched = []
-        sorted_keywords = sorted(self.keyword_to_section.keys(),
-                                 key=len, reverse=True)
-        for keyword in sorted_keywords:
-            if keyword in query_lower and keyword not in matched:
-                matched.append(keyword)
+        matched = [keyword for keyword, _ in self._sorted_keywords
+                   if keyword in query_lower]
 
         # Get descriptions
         descriptions = [self.get_section_info(st) for st in section_types]
@@ -4,9 +4,11 @@ Complete pipeline: Query → Intent → TOC → Parse → Chunk → Embed → Re
 """
 
 import os
-import json
 import glob
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Optional
+import numpy as np
 import ollama
 
 from query_intent import QueryIntentMapper
@@ -16,6 +18,12 @@ from table_chunker import TableChunker
 from embeddings import EmbeddingManager
 from vector_store import TOCEnhancedVectorStore
 
+# Chunks embedded per step while the previous step is written to ChromaDB
+INGEST_BATCH_SIZE = 256
+
+# Query embeddings kept in memory (repeat questions skip the forward pass)
+QUERY_EMBEDDING_CACHE_SIZE = 4096
+
 
 class WellReportRAG:
     """
@@ -59,10 +67,10 @@ class WellReportRAG:
         print("INITIALIZING RAG SYSTEM")
         print("="*80)
 
-        # Load TOC database
+        # Load TOC database (parsed once, shared with the page-targeted parser)
         print(f"\n[LOAD] Loading TOC database from {toc_database_path}...")
-        with open(toc_database_path, 'r') as f:
-            self.toc_database = json.load(f)
+        self.parser = TOCEnhancedParser(toc_database_path)
+        self.toc_database = self.parser.toc_db
         print(f"[OK] Loaded TOC database: {len(self.toc_database)} wells")
 
         # Auto-detect data directory (Docker vs local)
@@ -83,7 +91,6 @@ class WellReportRAG:
         self.intent_mapper = QueryIntentMapper()
         print("[OK] Query intent mapper ready")
 
-        self.parser = TOCEnhancedParser(toc_database_path)
         print("[OK] TOC-enhanced parser ready")
 
         self.chunker = SectionAwareChunker(chunk_size=1000, overlap=200)
@@ -93,6 +100,9 @@ class WellReportRAG:
         print("[OK] Table chunker ready")
 
         self.embedding_manager = EmbeddingManager()
+        self._cached_query_embedding = lru_cache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)(
+            self._compute_query_embedding
+        )
         print("[OK] Embedding manager ready")
 
         # Use environment variables if not provided
@@ -236,15 +246,11 @@ class WellReportRAG:
         chunks = text_chunks + table_chunks
         print(f"[OK] Total chunks: {len(chunks)} ({len(text_chunks)} text + {len(table_chunks)} tables)")
 
-        # Generate embeddings
-        print(f"\n[EMBED] Generating embeddings...")
-        chunks_with_embeddings = self.embedding_manager.embed_chunks(chunks)
+        # Generate embeddings and add to vector store
+        print(f"\n[EMBED] Generating embeddings and adding to vector store...")
+        num_added = self._embed_and_store(chunks, well_name, skip_existing=not reindex)
         print(f"[OK] Embeddings generated")
 
-        # Add to vector store
-        print(f"\n[SAVE] Adding to vector store...")
-        num_added = self.vector_store.add_documents(chunks_with_embeddings, well_name)
-
         print(f"\n{'='*80}")
         print(f"[OK] {well_name} INDEXED: {num_added} chunks")
         print(f"{'='*80}")
@@ -256,6 +262,76 @@ class WellReportRAG:
             'pages_processed': all_pages
         }
 
+    def _embed_and_store(self,
+                         chunks: List[Dict],
+                         well_name: str,
+                         skip_existing: bool = False) -> int:
+        """
+        Embed chunks in batches and add them to the vector store
+
+        The ChromaDB insert of one batch runs on a background thread while
+        the next batch is embedded, so ingest takes roughly
+        max(embed, insert) instead of embed + insert.
+
+        Args:
+            chunks: Chunks with 'text' and 'metadata'
+            well_name: Well identifier
+            skip_existing: Skip batches whose chunk IDs are all stored already
+                           (re-runs without reindex don't re-embed them)
+
+        Returns:
+            Number of chunks in the vector store (added now or already present)
+        """
+        num_added = 0
+        num_skipped = 0
+        pending = None
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            for start in range(0, len(chunks), INGEST_BATCH_SIZE):
+                batch = chunks[start:start + INGEST_BATCH_SIZE]
+
+                if skip_existing and self.vector_store.count_existing_chunks(
+                        well_name, start, len(batch)) == len(batch):
+                    num_skipped += len(batch)
+                    continue
+
+                batch = self.embedding_manager.embed_chunks(batch)
+
+                # Wait for the previous insert before queueing the next one
+                if pending is not None:
+                    num_added += pending.result()
+
+                pending = executor.submit(self._store_batch, batch, well_name, start)
+
+            if pending is not None:
+                num_added += pending.result()
+
+        if num_skipped:
+            print(f"[INFO]  {num_skipped} chunks already indexed, skipped (use reindex=True to rebuild)")
+
+        return num_added + num_skipped
+
+    def _store_batch(self, batch: List[Dict], well_name: str, start: int) -> int:
+        """
+        Add one embedded batch to the vector store, then drop its embeddings
+
+        The batch dicts are shared with the caller's full chunk list, so the
+        embeddings are removed once stored to keep peak memory at one or two
+        batches instead of the whole document.
+
+        Args:
+            batch: Chunks with 'text', 'metadata' and 'embedding'
+            well_name: Well identifier
+            start: Index of the batch's first chunk within the well
+
+        Returns:
+            Number of chunks added
+        """
+        num_added = self.vector_store.add_documents(batch, well_name, start_index=start)
+        for chunk in batch:
+            chunk.pop('embedding', None)
+        return num_added
+
     def query(self,
              query: str,
              well_name: Optional[str] = None,
@@ -279,6 +355,69 @@ class WellReportRAG:
                 'section_types_used': List[str]
             }
         """
+        print("\n[EMBED] Generating query embedding...")
+        query_embedding = self.embed_query(query)
+
+        return self.query_with_embedding(
+            query, query_embedding,
+            well_name=well_name,
+            n_results=n_results,
+            temperature=temperature
+        )
+
+    def embed_query(self, query: str) -> np.ndarray:
+        """
+        Embed a query string, reusing the vector for repeated questions
+
+        Args:
+            query: Natural language query
+
+        Returns:
+            Query embedding (768-dim float32 array, do not modify in place)
+        """
+        return self._cached_query_embedding(query)
+
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Embed many queries in one batched forward pass
+
+        Use with query_with_embedding() when answering a known question set,
+        instead of embedding each question inside query().
+
+        Args:
+            queries: Natural language queries
+
+        Returns:
+            (len(queries), 768) float32 array, row i = embedding of queries[i]
+        """
+        return self.embedding_manager.embed_texts(queries, as_numpy=True)
+
+    def _compute_query_embedding(self, query: str) -> np.ndarray:
+        """Uncached query embedding (wrapped by an LRU cache in __init__)"""
+        return self.embedding_manager.embed_text(query, as_numpy=True)
+
+    def query_with_embedding(self,
+                             query: str,
+                             query_embedding: np.ndarray,
+                             well_name: Optional[str] = None,
+                             n_results: int = 5,
+                             temperature: float = 0.1) -> Dict:
+        """
+        Query the RAG system with a precomputed query embedding
+
+        Same pipeline as query(), minus the embedding step - for callers that
+        embed many questions up front (e.g. evaluation runs).
+
+        Args:
+            query: Natural language query (used for intent mapping and the prompt)
+            query_embedding: Embedding of the query
+            well_name: Well to search (None = search all wells)
+            n_results: Number of context chunks to retrieve
+            temperature: LLM temperature (0.1 = factual, 0.7 = creative)
+
+        Returns:
+            Same dict as query()
+        """
         print(f"\n{'='*80}")
         print(f"QUERY: {query}")
         print(f"{'='*80}")
@@ -288,11 +427,7 @@ class WellReportRAG:
         section_types = self.intent_mapper.get_section_types(query)
         print(f"[OK] Target sections: {', '.join(section_types)}")
 
-        # Step 2: Generate query embedding
-        print("\n[EMBED] Generating query embedding...")
-        query_embedding = self.embedding_manager.embed_text(query)
-
-        # Step 3: Retrieve relevant chunks
+        # Step 2: Retrieve relevant chunks
         print(f"\n Retrieving top {n_results} chunks...")
         if well_name:
             results = self.vector_store.query_with_section_filter(
@@ -320,7 +455,7 @@ class WellReportRAG:
                 'section_types_used': section_types
             }
 
-        # Step 4: Build context from retrieved chunks
+        # Step 3: Build context from retrieved chunks
         context_parts = []
         sources = []
 
@@ -343,7 +478,7 @@ class WellReportRAG:
 
         context = "\n---\n".join(context_parts)
 
-        # Step 5: Generate answer with Ollama
+        # Step 4: Generate answer with Ollama
         print(f"\n[LLM] Generating answer with {self.model_name}...")
 
         prompt = f"""You are an expert geothermal engineer analyzing well completion reports.
@@ -469,6 +604,7 @@ Answer (with citations):"""
         pdfs_skipped = []
         total_chunks = 0
         indexed_files = set()
+        indexed_entries = {}  # TOC entry -> PDF it was indexed from
 
         for pdf_path in pdf_files:
             pdf_name = os.path.basename(pdf_path)
@@ -480,7 +616,12 @@ Answer (with citations):"""
                     matching_entry = entry_key
                     break
 
-            if matching_entry:
+            if matching_entry in indexed_entries:
+                # Same report found twice (e.g. copies in 'Well report/' and 'EOWR/');
+                # index_well() would parse and embed the identical PDF again
+                print(f"\n[INFO]  Skipped duplicate: {pdf_name}")
+                print(f"   TOC entry {matching_entry} already indexed from {indexed_entries[matching_entry]}")
+            elif matching_entry:
                 print(f"\n[OK] Found TOC-indexed PDF: {pdf_name}")
                 print(f"   Using TOC entry: {matching_entry}")
 
@@ -490,6 +631,7 @@ Answer (with citations):"""
                     pdfs_indexed += 1
                     total_chunks += result['chunks_indexed']
                     indexed_files.add(pdf_name)
+                    indexed_entries[matching_entry] = os.path.relpath(pdf_path, report_dir)
                 except Exception as e:
                     print(f"[ERROR] Failed to index {pdf_name}: {e}")
                     pdfs_skipped.append(pdf_name)
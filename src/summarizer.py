@@ -175,7 +175,7 @@ class ReportSummarizer:
         # Generate embedding for generic retrieval
         # Use a broad query to get representative chunks
         generic_query = f"Provide comprehensive information about {', '.join(section_types)}"
-        query_embedding = self.rag.embedding_manager.embed_text(generic_query)
+        query_embedding = self.rag.embedding_manager.embed_text(generic_query, as_numpy=True)
 
         # Retrieve with filters
         results = self.rag.vector_store.query_with_filters(
@@ -213,7 +213,7 @@ class ReportSummarizer:
         """
         # Generic query for table retrieval
         generic_query = f"Tables related to {', '.join(section_types)}"
-        query_embedding = self.rag.embedding_manager.embed_text(generic_query)
+        query_embedding = self.rag.embedding_manager.embed_text(generic_query, as_numpy=True)
 
         # Retrieve with filters
         results = self.rag.vector_store.query_with_filters(
@@ -10,9 +10,15 @@ Key Features:
     - Support context-aware table prioritization
 """
 
+import hashlib
+import pickle
+from collections import OrderedDict
 from typing import List, Dict, Optional
 import pandas as pd
 
+# Rendered tables remembered per chunker (boilerplate tables recur across wells)
+MARKDOWN_CACHE_SIZE = 4096
+
 
 class TableChunker:
     """
@@ -35,7 +41,8 @@ class TableChunker:
 
     def __init__(self):
         """Initialize table chunker"""
-        pass
+        # Table content digest -> markdown, least recently used first
+        self._markdown_cache = OrderedDict()
 
     def chunk_tables(self,
                      tables: List,
@@ -112,20 +119,28 @@ class TableChunker:
         Returns:
             Markdown-formatted table string
         """
+        # Docling TableItem: .data is a TableData cell grid, not a DataFrame.
+        # Let Docling build the DataFrame and render it with tabulate.
+        if hasattr(table, 'export_to_dataframe'):
+            try:
+                return self._dataframe_to_markdown(table.export_to_dataframe())
+            except Exception:
+                pass
+
         # Try different attributes based on Docling version
         if hasattr(table, 'data') and table.data is not None:
             # Table has structured data (DataFrame)
             if isinstance(table.data, pd.DataFrame):
-                return table.data.to_markdown(index=False)
+                return self._dataframe_to_markdown(table.data)
             elif isinstance(table.data, list):
                 # List of lists/dicts
                 df = pd.DataFrame(table.data)
-                return df.to_markdown(index=False)
+                return self._dataframe_to_markdown(df)
             else:
                 # Unknown format, try converting to DataFrame
                 try:
                     df = pd.DataFrame(table.data)
-                    return df.to_markdown(index=False)
+                    return self._dataframe_to_markdown(df)
                 except:
                     pass
 
@@ -136,6 +151,45 @@ class TableChunker:
         # Last resort: string representation
         return str(table)
 
+    def _dataframe_to_markdown(self, df: pd.DataFrame) -> str:
+        """
+        Render a DataFrame as markdown, reusing the result for identical tables
+
+        The cache key is a digest of the pickled column labels, dtypes and
+        column values. Pickling keeps each cell's exact type and value, so
+        tables that merely hash alike (pandas' row hashes map b'x' and 'x',
+        or None and NaN, to the same value) never share an entry.
+
+        Args:
+            df: Table data
+
+        Returns:
+            Markdown-formatted table string
+        """
+        try:
+            payload = pickle.dumps(
+                (df.columns.tolist(),
+                 [str(dtype) for dtype in df.dtypes],
+                 [column.to_numpy() for _, column in df.items()]),
+                protocol=pickle.HIGHEST_PROTOCOL
+            )
+        except Exception:
+            # Unpicklable cells - render without caching
+            return df.to_markdown(index=False)
+
+        key = hashlib.blake2b(payload, digest_size=16).digest()
+
+        markdown = self._markdown_cache.get(key)
+        if markdown is not None:
+            self._markdown_cache.move_to_end(key)
+            return markdown
+
+        markdown = df.to_markdown(index=False)
+        self._markdown_cache[key] = markdown
+        if len(self._markdown_cache) > MARKDOWN_CACHE_SIZE:
+            self._markdown_cache.popitem(last=False)
+        return markdown
+
     def _get_table_caption(self, table, index: int) -> str:
         """
         Extract table caption or generate default
@@ -4,17 +4,23 @@ Uses TOC database for page-targeted parsing (30-86x faster than full document)
 """
 
 import json
+from functools import cached_property
+from io import BytesIO
+from itertools import chain
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import fitz  # PyMuPDF
-import tempfile
-import os
 
 from docling.document_converter import DocumentConverter
 from docling.datamodel.pipeline_options import PdfPipelineOptions
-from docling.datamodel.base_models import InputFormat
+from docling.datamodel.base_models import InputFormat, DocumentStream
 from docling.document_converter import PdfFormatOption
 
+try:
+    import orjson  # Optional: faster JSON parsing
+except ImportError:
+    orjson = None
+
 
 class TOCEnhancedParser:
     """
@@ -42,12 +48,67 @@ class TOCEnhancedParser:
         """
         self.toc_db_path = Path(toc_db_path)
         self.toc_db = self._load_toc_db()
+        self._scanned_cache: Dict[str, bool] = {}
+        self._build_section_index()
 
     def _load_toc_db(self) -> Dict:
-        """Load TOC database from JSON"""
+        """Load TOC database from JSON (uses orjson when installed)"""
+        if orjson is not None:
+            return orjson.loads(self.toc_db_path.read_bytes())
+
         with open(self.toc_db_path, 'r', encoding='utf-8') as f:
             return json.load(f)
 
+    def _build_section_index(self):
+        """
+        Precompute well → section_type → pages/metadata lookups
+
+        Queries then resolve with two dict lookups instead of walking
+        key_sections on every call
+        """
+        self._index: Dict[str, Dict[str, Tuple[int, ...]]] = {}
+        self._metadata_index: Dict[str, Dict[str, Tuple[Dict, ...]]] = {}
+
+        for well_name, well_data in self.toc_db.items():
+            pages_by_type = {}
+            metadata_by_type = {}
+            for section_type, sections in well_data.get('key_sections', {}).items():
+                pages_by_type[section_type] = tuple(sec['page'] for sec in sections)
+                metadata_by_type[section_type] = tuple(
+                    {
+                        'number': sec['number'],
+                        'title': sec['title'],
+                        'page': sec['page'],
+                        'type': section_type
+                    }
+                    for sec in sections
+                )
+            self._index[well_name] = pages_by_type
+            self._metadata_index[well_name] = metadata_by_type
+
+    @staticmethod
+    def _build_converter(do_ocr: bool) -> DocumentConverter:
+        """Build a Docling converter with table structure enabled"""
+        pipeline_options = PdfPipelineOptions()
+        pipeline_options.do_ocr = do_ocr
+        pipeline_options.do_table_structure = True
+
+        return DocumentConverter(
+            format_options={
+                InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)
+            }
+        )
+
+    @cached_property
+    def _converter_text(self) -> DocumentConverter:
+        """Converter for native PDFs (built on first use, then reused)"""
+        return self._build_converter(do_ocr=False)
+
+    @cached_property
+    def _converter_ocr(self) -> DocumentConverter:
+        """Converter for scanned PDFs (OCR models only loaded if needed)"""
+        return self._build_converter(do_ocr=True)
+
     def get_section_pages(self, well_name: str, section_types: List[str]) -> List[int]:
         """
         Get page numbers for specific section types
@@ -64,15 +125,14 @@ class TOCEnhancedParser:
             >>> parser.get_section_pages('Well 5', ['depth', 'borehole'])
             [4, 6, 20, 22, 26, 28]
         """
-        well_data = self.toc_db.get(well_name)
-        if not well_data:
+        pages_by_type = self._index.get(well_name)
+        if pages_by_type is None:
             raise ValueError(f"Well '{well_name}' not found in TOC database")
 
         pages = set()
-        for section_type in section_types:
-            sections = well_data['key_sections'].get(section_type, [])
-            for sec in sections:
-                pages.add(sec['page'])
+        pages.update(chain.from_iterable(
+            pages_by_type.get(section_type, ()) for section_type in section_types
+        ))
 
         return sorted(pages)
 
@@ -94,22 +154,16 @@ class TOCEnhancedParser:
                 {'number': '3.7', 'title': 'Directional drilling data', 'page': 26, 'type': 'depth'}
             ]
         """
-        well_data = self.toc_db.get(well_name)
-        if not well_data:
+        metadata_by_type = self._metadata_index.get(well_name)
+        if not metadata_by_type:
             return []
 
-        metadata = []
-        for section_type in section_types:
-            sections = well_data['key_sections'].get(section_type, [])
-            for sec in sections:
-                metadata.append({
-                    'number': sec['number'],
-                    'title': sec['title'],
-                    'page': sec['page'],
-                    'type': section_type
-                })
-
-        return metadata
+        # Copy entries so callers can't mutate the shared index
+        return [
+            dict(sec)
+            for section_type in section_types
+            for sec in metadata_by_type.get(section_type, ())
+        ]
 
     def parse_targeted_pages(self,
                              pdf_path: str,
@@ -118,7 +172,7 @@ class TOCEnhancedParser:
         """
         Parse only specific pages from PDF
 
-        Optimization: Extract target pages to temp PDF, then parse with Docling
+        Optimization: Extract target pages to an in-memory PDF, then parse with Docling
         This is 30-86x faster than parsing the full document
 
         Args:
@@ -145,11 +199,8 @@ class TOCEnhancedParser:
                 'parse_method': 'page_targeted'
             }
 
-        # Step 1: Extract target pages to temp PDF
+        # Step 1: Extract target pages to in-memory PDF (no temp file round-trip)
         doc = fitz.open(pdf_path)
-        temp_pdf = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
-        temp_path = temp_pdf.name
-        temp_pdf.close()
 
         new_doc = fitz.open()
         for page_num in pages:
@@ -157,33 +208,23 @@ class TOCEnhancedParser:
             if 0 < page_num <= len(doc):
                 new_doc.insert_pdf(doc, from_page=page_num-1, to_page=page_num-1)
 
-        new_doc.save(temp_path)
+        pdf_bytes = new_doc.tobytes()
         new_doc.close()
         doc.close()
 
         # Step 2: Check if scanned (for OCR decision)
         is_scanned = self._is_scanned_pdf(pdf_path)
 
-        # Step 3: Parse with Docling
-        pipeline_options = PdfPipelineOptions()
-        pipeline_options.do_ocr = is_scanned
-        pipeline_options.do_table_structure = True
-
-        converter = DocumentConverter(
-            format_options={
-                InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)
-            }
-        )
+        # Step 3: Parse with Docling (reuse converter across calls)
+        converter = self._converter_ocr if is_scanned else self._converter_text
 
-        result = converter.convert(temp_path)
+        source = DocumentStream(name=f"{Path(pdf_path).stem}_pages.pdf", stream=BytesIO(pdf_bytes))
+        result = converter.convert(source)
         markdown = result.document.export_to_markdown()
 
         # Extract tables separately
         tables = result.document.tables if hasattr(result.document, 'tables') else []
 
-        # Clean up temp file
-        os.unlink(temp_path)
-
         return {
             'text': markdown,
             'tables': tables,
@@ -203,17 +244,23 @@ class TOCEnhancedParser:
         Returns:
             True if scanned image, False if native PDF
         """
+        pdf_key = str(pdf_path)
+        if pdf_key in self._scanned_cache:
+            return self._scanned_cache[pdf_key]
+
         doc = fitz.open(pdf_path)
 
         # Check first 3 pages
+        is_scanned = True  # No text found → scanned image
         for page_num in range(min(3, len(doc))):
             text = doc[page_num].get_text()
             if len(text.strip()) > 50:  # Has text content
-                doc.close()
-                return False
+                is_scanned = False
+                break
 
         doc.close()
-        return True  # No text found → scanned image
+        self._scanned_cache[pdf_key] = is_scanned
+        return is_scanned
 
     def get_well_pdf_path(self, well_name: str) -> Optional[str]:
         """
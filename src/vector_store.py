@@ -3,10 +3,118 @@ TOC-Enhanced Vector Store
 ChromaDB integration with metadata filtering for targeted retrieval
 """
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
+import numpy as np
 import chromadb
 from chromadb.config import Settings
 
+# Fallback when the client can't report its limit (ChromaDB's SQLite default)
+DEFAULT_MAX_BATCH_SIZE = 5461
+
+# Metadata value types ChromaDB stores as-is (bool is an int subclass, kept too)
+_ALLOWED_METADATA_TYPES = frozenset({str, int, float, bool})
+
+# Query vectors may be Python lists or NumPy arrays (no list round-trip needed)
+Embedding = Union[List[float], np.ndarray]
+
+# Embeddings are L2-normalized on the way in, so inner product == cosine similarity
+COLLECTION_METADATA = {
+    "description": "Geothermal well reports with TOC metadata",
+    "hnsw:space": "ip"
+}
+
+
+_RESULT_KEYS = ('documents', 'metadatas', 'distances', 'ids')
+
+# One ChromaDB client per (host, port, persist_directory) for the whole process
+_CLIENTS: Dict[tuple, object] = {}
+
+# Filter spec key -> metadata field it restricts (values are lists, matched with $in)
+_FILTER_FIELDS = {
+    'section_types': 'section_type',
+    'chunk_types': 'chunk_type',
+    'document_names': 'document_name',
+}
+
+
+def _get_client(chroma_host: Optional[str],
+                chroma_port: Optional[int],
+                persist_directory: Optional[str]):
+    """
+    Get (or create) the shared ChromaDB client for a connection target
+
+    Re-creating a PersistentClient reopens SQLite and reloads the HNSW index
+    from disk, so every vector store in the process reuses the same client.
+
+    Args:
+        chroma_host: ChromaDB server host (None for local)
+        chroma_port: ChromaDB server port (None for local)
+        persist_directory: Directory for persistent storage
+
+    Returns:
+        chromadb HttpClient or PersistentClient
+    """
+    if chroma_host:
+        key = ('http', chroma_host, chroma_port or 8000)
+    else:
+        key = ('local', persist_directory or "./chroma_db")
+
+    client = _CLIENTS.get(key)
+    if client is not None:
+        return client
+
+    if chroma_host:
+        # Connect to ChromaDB server (Docker setup)
+        client = chromadb.HttpClient(
+            host=chroma_host,
+            port=chroma_port or 8000
+        )
+        print(f"[OK] Connected to ChromaDB server at {chroma_host}:{chroma_port or 8000}")
+    else:
+        # Use local persistent storage
+        client = chromadb.PersistentClient(
+            path=persist_directory or "./chroma_db"
+        )
+        print(f"[OK] Using local ChromaDB at {persist_directory or './chroma_db'}")
+
+    _CLIENTS[key] = client
+    return client
+
+
+def _unpack_results(results: Dict, index: int) -> Dict:
+    """
+    Pull one query's results out of a ChromaDB batched query response
+
+    Args:
+        results: Raw collection.query() response (lists of per-query lists)
+        index: Position of the query in the batch
+
+    Returns:
+        {'documents': [...], 'metadatas': [...], 'distances': [...], 'ids': [...]}
+    """
+    unpacked = {}
+    for key in _RESULT_KEYS:
+        per_query = results.get(key)
+        unpacked[key] = per_query[index] if per_query else []
+    return unpacked
+
+
+def _normalize(embeddings) -> np.ndarray:
+    """
+    L2-normalize embedding vectors (rows) as a float32 array
+
+    Args:
+        embeddings: One vector or a list/array of vectors
+
+    Returns:
+        2D float32 array of unit-length rows (zero vectors left as-is)
+    """
+    # Always copies, so the caller's array is never normalized in place
+    vectors = np.array(embeddings, dtype=np.float32, ndmin=2)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
 
 class TOCEnhancedVectorStore:
     """
@@ -43,42 +151,46 @@ class TOCEnhancedVectorStore:
             chroma_port: ChromaDB server port (None for local)
             persist_directory: Directory for persistent storage
         """
-        # Initialize ChromaDB client
-        if chroma_host:
-            # Connect to ChromaDB server (Docker setup)
-            self.client = chromadb.HttpClient(
-                host=chroma_host,
-                port=chroma_port or 8000
-            )
-            print(f"[OK] Connected to ChromaDB server at {chroma_host}:{chroma_port or 8000}")
-        else:
-            # Use local persistent storage
-            self.client = chromadb.PersistentClient(
-                path=persist_directory or "./chroma_db"
-            )
-            print(f"[OK] Using local ChromaDB at {persist_directory or './chroma_db'}")
+        # Initialize ChromaDB client (shared per process, see _get_client)
+        self.client = _get_client(chroma_host, chroma_port, persist_directory)
 
         # Get or create collection
         self.collection = self.client.get_or_create_collection(
             name=collection_name,
-            metadata={"description": "Geothermal well reports with TOC metadata"}
+            metadata=COLLECTION_METADATA
         )
 
         self.collection_name = collection_name
         print(f"[OK] Collection '{collection_name}' ready")
 
+        # Largest batch the server accepts in one add() call (queried once)
+        self.max_batch_size = self._get_max_batch_size()
+
+    def _get_max_batch_size(self) -> int:
+        """Ask the ChromaDB client for its max add() batch size"""
+        if hasattr(self.client, 'get_max_batch_size'):
+            return self.client.get_max_batch_size()
+        # Older chromadb versions expose it as a property
+        return getattr(self.client, 'max_batch_size', DEFAULT_MAX_BATCH_SIZE)
+
     def add_documents(self,
                      chunks: List[Dict],
                      well_name: str,
-                     batch_size: int = 100) -> int:
+                     batch_size: Optional[int] = None,
+                     start_index: int = 0) -> int:
         """
         Add document chunks to vector store
 
+        All chunks go to ChromaDB in a single add() call unless they exceed
+        the server's max batch size, in which case they are split at that limit.
+
         Args:
             chunks: List of chunks with 'text', 'embedding', 'metadata'
                 [{'text': '...', 'embedding': [...], 'metadata': {...}}, ...]
             well_name: Well identifier for filtering
-            batch_size: Batch size for adding documents
+            batch_size: Batch size for adding documents (None = server max)
+            start_index: Index of the first chunk, for adding a well's chunks
+                         in several calls without ID collisions
 
         Returns:
             Number of chunks added
@@ -87,53 +199,64 @@ class TOCEnhancedVectorStore:
             print("[WARN]  No chunks to add")
             return 0
 
-        # Prepare data for ChromaDB
-        ids = []
-        embeddings = []
-        documents = []
-        metadatas = []
+        # Prepare data for ChromaDB (preallocated, filled by index)
+        # Embeddings go into one contiguous float32 array instead of nested lists
+        num_chunks = len(chunks)
+        if 'embedding' not in chunks[0]:
+            raise ValueError("Chunk 0 missing 'embedding' field")
+        dimension = len(chunks[0]['embedding'])
+
+        ids = [None] * num_chunks
+        embeddings = np.empty((num_chunks, dimension), dtype=np.float32)
+        documents = [None] * num_chunks
+        metadatas = [None] * num_chunks
 
         for i, chunk in enumerate(chunks):
             # Generate unique ID
-            chunk_id = f"{well_name}_chunk_{i}"
-            ids.append(chunk_id)
+            ids[i] = f"{well_name}_chunk_{start_index + i}"
 
             # Extract embedding (should already be computed)
             if 'embedding' not in chunk:
                 raise ValueError(f"Chunk {i} missing 'embedding' field")
-            embeddings.append(chunk['embedding'])
+            embeddings[i] = chunk['embedding']
 
             # Extract text
-            documents.append(chunk['text'])
+            documents[i] = chunk['text']
 
             # Build metadata
             metadata = {
                 'well_name': well_name,
-                'chunk_index': i,
+                'chunk_index': start_index + i,
                 **chunk.get('metadata', {})
             }
 
             # ChromaDB requires all metadata values to be strings, ints, or floats
-            # Convert None to empty string
-            clean_metadata = {}
-            for key, value in metadata.items():
-                if value is None:
-                    clean_metadata[key] = ""
-                elif isinstance(value, (str, int, float)):
-                    clean_metadata[key] = value
-                else:
-                    clean_metadata[key] = str(value)
-
-            metadatas.append(clean_metadata)
-
-        # Add to ChromaDB in batches
+            # Convert None to empty string, anything else to str
+            # (exact types are the fast path; subclasses such as np.float64
+            # or IntEnum stay numeric so `where` filters still compare them)
+            if all(type(value) in _ALLOWED_METADATA_TYPES for value in metadata.values()):
+                metadatas[i] = metadata
+            else:
+                metadatas[i] = {
+                    key: "" if value is None
+                    else value if isinstance(value, (str, int, float))
+                    else str(value)
+                    for key, value in metadata.items()
+                }
+
+        # Unit-length vectors: inner-product search ranks like cosine
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        np.divide(embeddings, norms, out=embeddings, where=norms > 0)
+
+        # Add to ChromaDB (single call unless over the server limit)
+        batch_size = min(batch_size or self.max_batch_size, self.max_batch_size)
         total_added = 0
         for start_idx in range(0, len(ids), batch_size):
             end_idx = min(start_idx + batch_size, len(ids))
 
             self.collection.add(
                 ids=ids[start_idx:end_idx],
-                embeddings=embeddings[start_idx:end_idx],
+                embeddings=embeddings[start_idx:end_idx],  # array view, no copy
                 documents=documents[start_idx:end_idx],
                 metadatas=metadatas[start_idx:end_idx]
             )
@@ -143,8 +266,31 @@ class TOCEnhancedVectorStore:
         print(f"[OK] Added {total_added} chunks for {well_name}")
         return total_added
 
+    def count_existing_chunks(self, well_name: str, start_index: int, num_chunks: int) -> int:
+        """
+        Count how many of a well's chunk IDs are already stored
+
+        IDs follow add_documents' scheme ({well_name}_chunk_{index}), so a
+        re-run can tell which batches were indexed before without embedding
+        them again.
+
+        Args:
+            well_name: Well identifier
+            start_index: Index of the first chunk to check
+            num_chunks: Number of consecutive chunk indices to check
+
+        Returns:
+            Number of those IDs present in the collection
+        """
+        if num_chunks <= 0:
+            return 0
+
+        ids = [f"{well_name}_chunk_{start_index + i}" for i in range(num_chunks)]
+        existing = self.collection.get(ids=ids, include=[])
+        return len(existing['ids'])
+
     def query_with_section_filter(self,
-                                  query_embedding: List[float],
+                                  query_embedding: Embedding,
                                   well_name: str,
                                   section_types: Optional[List[str]] = None,
                                   n_results: int = 5) -> Dict:
@@ -181,56 +327,59 @@ class TOCEnhancedVectorStore:
 
         # Query ChromaDB
         results = self.collection.query(
-            query_embeddings=[query_embedding],
+            query_embeddings=_normalize(query_embedding),
             n_results=n_results,
             where=where_clause,
             include=['documents', 'metadatas', 'distances']
         )
 
         # Return first result (we only sent one query)
-        return {
-            'documents': results['documents'][0] if results['documents'] else [],
-            'metadatas': results['metadatas'][0] if results['metadatas'] else [],
-            'distances': results['distances'][0] if results['distances'] else [],
-            'ids': results['ids'][0] if results['ids'] else []
-        }
+        return _unpack_results(results, 0)
 
     def query_all_wells(self,
-                       query_embedding: List[float],
+                       query_embedding: Embedding,
                        section_types: Optional[List[str]] = None,
-                       n_results: int = 5) -> Dict:
+                       n_results: int = 5,
+                       well_names: Optional[List[str]] = None) -> Dict:
         """
-        Query across all wells (no well_name filter)
+        Query across all wells (no well_name filter), or a subset of wells
 
         Args:
             query_embedding: Query embedding vector
             section_types: List of section types to filter by
             n_results: Number of results to return
+            well_names: Restrict to these wells (None = all wells).
+                        Uses a single $in filter instead of one query per well
 
         Returns:
             Same format as query_with_section_filter
         """
-        where_clause = {}
+        filters = []
+
+        if well_names:
+            filters.append({"well_name": {"$in": well_names}})
 
         if section_types:
-            where_clause["section_type"] = {"$in": section_types}
+            filters.append({"section_type": {"$in": section_types}})
+
+        if len(filters) > 1:
+            where_clause = {"$and": filters}
+        elif len(filters) == 1:
+            where_clause = filters[0]
+        else:
+            where_clause = None  # No filters
 
         results = self.collection.query(
-            query_embeddings=[query_embedding],
+            query_embeddings=_normalize(query_embedding),
             n_results=n_results,
-            where=where_clause if where_clause else None,
+            where=where_clause,
             include=['documents', 'metadatas', 'distances']
         )
 
-        return {
-            'documents': results['documents'][0] if results['documents'] else [],
-            'metadatas': results['metadatas'][0] if results['metadatas'] else [],
-            'distances': results['distances'][0] if results['distances'] else [],
-            'ids': results['ids'][0] if results['ids'] else []
-        }
+        return _unpack_results(results, 0)
 
     def query_with_filters(self,
-                          query_embedding: List[float],
+                          query_embedding: Embedding,
                           well_name: Optional[str] = None,
                           section_types: Optional[List[str]] = None,
                           chunk_types: Optional[List[str]] = None,
@@ -271,6 +420,44 @@ class TOCEnhancedVectorStore:
             # Get all chunks (text+tables) from Well 5, depth sections only
             query_with_filters(emb, well_name='Well 5', section_types=['depth'])
         """
+        return self.query_batch(
+            query_embeddings=[query_embedding],
+            well_name=well_name,
+            section_types=section_types,
+            chunk_types=chunk_types,
+            document_names=document_names,
+            n_results=n_results
+        )[0]
+
+    def query_batch(self,
+                    query_embeddings: Union[List[List[float]], np.ndarray],
+                    well_name: Optional[str] = None,
+                    section_types: Optional[List[str]] = None,
+                    chunk_types: Optional[List[str]] = None,
+                    document_names: Optional[List[str]] = None,
+                    n_results: int = 10) -> List[Dict]:
+        """
+        Run several queries that share the same filters in one ChromaDB call
+
+        One round-trip for N queries: the metadata filter is evaluated once
+        and the HNSW search is done server-side for the whole batch.
+
+        Args:
+            query_embeddings: List of query embedding vectors
+            well_name: Well identifier (None = all wells)
+            section_types: Section types to filter by
+            chunk_types: Chunk types ('text', 'table')
+            document_names: Document filenames to filter by
+            n_results: Number of results to return per query
+
+        Returns:
+            One result dict per query embedding, in input order,
+            each in the same format as query_with_filters
+        """
+        # len() rather than truthiness: NumPy batches have no truth value
+        if len(query_embeddings) == 0:
+            return []
+
         # Build filter conditions
         filters = []
 
@@ -296,19 +483,87 @@ class TOCEnhancedVectorStore:
 
         # Query ChromaDB
         results = self.collection.query(
-            query_embeddings=[query_embedding],
+            query_embeddings=_normalize(query_embeddings),
             n_results=n_results,
             where=where_clause,
             include=['documents', 'metadatas', 'distances']
         )
 
-        # Return first result (we only sent one query)
-        return {
-            'documents': results['documents'][0] if results['documents'] else [],
-            'metadatas': results['metadatas'][0] if results['metadatas'] else [],
-            'distances': results['distances'][0] if results['distances'] else [],
-            'ids': results['ids'][0] if results['ids'] else []
-        }
+        # Split batched result lists into one dict per query
+        return [_unpack_results(results, i) for i in range(len(query_embeddings))]
+
+    def batch_query_with_filters(self,
+                                 query_embedding: Embedding,
+                                 filters_list: List[Dict],
+                                 n_results: int = 10,
+                                 candidate_multiplier: int = 4) -> List[Dict]:
+        """
+        Run one query embedding against several filter combinations
+
+        Issues a single over-fetched search (restricted only to the well, if
+        all filters share one) and applies each filter to the candidates
+        client-side. A filter that can't be satisfied from the candidate pool
+        falls back to its own exact query_with_filters() call, so results
+        match running each filter separately.
+
+        Args:
+            query_embedding: Query embedding vector
+            filters_list: One dict per result set, with the query_with_filters
+                          filter arguments, e.g.
+                          [{'well_name': 'Well 5', 'chunk_types': ['table']},
+                           {'well_name': 'Well 5', 'section_types': ['casing']}]
+            n_results: Number of results to return per filter
+            candidate_multiplier: Candidates fetched per filter, as a multiple
+                                  of n_results
+
+        Returns:
+            One result dict per filter, in input order,
+            each in the same format as query_with_filters
+        """
+        if not filters_list:
+            return []
+
+        well_names = {f.get('well_name') for f in filters_list}
+        shared_well = well_names.pop() if len(well_names) == 1 else None
+
+        n_candidates = n_results * candidate_multiplier * len(filters_list)
+        candidates = self.query_with_filters(
+            query_embedding=query_embedding,
+            well_name=shared_well,
+            n_results=n_candidates
+        )
+        pool_exhausted = len(candidates['ids']) < n_candidates
+
+        batched = []
+        for spec in filters_list:
+            # Plain sets for the membership checks below
+            allowed = {
+                field: set(spec[key])
+                for key, field in _FILTER_FIELDS.items() if spec.get(key)
+            }
+            well_name = spec.get('well_name')
+
+            result = {key: [] for key in _RESULT_KEYS}
+            for i, meta in enumerate(candidates['metadatas']):
+                if well_name and meta.get('well_name') != well_name:
+                    continue
+                if any(meta.get(field) not in values for field, values in allowed.items()):
+                    continue
+                for key in _RESULT_KEYS:
+                    result[key].append(candidates[key][i])
+                if len(result['ids']) == n_results:
+                    break
+
+            # Candidates ran out before n_results matches: only trust the
+            # short list if the pool already held every chunk in scope
+            if len(result['ids']) < n_results and not pool_exhausted:
+                result = self.query_with_filters(
+                    query_embedding=query_embedding, n_results=n_results, **spec
+                )
+
+            batched.append(result)
+
+        return batched
 
     def get_collection_stats(self) -> Dict:
         """Get statistics about the collection"""
@@ -348,7 +603,7 @@ class TOCEnhancedVectorStore:
         self.client.delete_collection(self.collection_name)
         self.collection = self.client.create_collection(
             name=self.collection_name,
-            metadata={"description": "Geothermal well reports with TOC metadata"}
+            metadata=COLLECTION_METADATA
         )
         print(f"[WARN]  Collection '{self.collection_name}' reset")
 
@@ -430,7 +685,7 @@ def main():
         print("\n" + "-"*80)
         print("Test Query 1: Filter by section type 'depth'")
         print("-"*80)
-        query_emb = [0.15] * 768  # Closer to depth chunk (0.1)
+        query_emb = [0.15] * 768  # Dummy query (section filter selects the depth chunk)
 
         results = store.query_with_section_filter(
             query_embedding=query_emb,
@@ -0,0 +1,23 @@
+"""
+Shared pytest fixtures
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def rag():
+    """
+    One WellReportRAG for the whole test session
+
+    Loading the embedding model and connecting to ChromaDB/Ollama is the
+    slowest part of every integration test, so it is done once and shared.
+    Tests run in file order, so later tests reuse the index built by
+    test_multi_pdf_indexing.
+    """
+    from rag_system import WellReportRAG
+    return WellReportRAG()
@@ -6,6 +6,9 @@ Tests:
 2. Multi-PDF indexing
 3. Filtered retrieval (chunk_type, document_name)
 4. Summarization with word limits
+
+Run with: pytest tests/test_integration.py -x -s
+(the WellReportRAG instance is a session fixture in conftest.py)
 """
 
 import sys
@@ -13,7 +16,6 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from table_chunker import TableChunker
-from rag_system import WellReportRAG
 from summarizer import ReportSummarizer
 import pandas as pd
 
@@ -59,18 +61,13 @@ def test_table_chunking():
     print(f"   Section: {chunks[0]['metadata']['section_number']} - {chunks[0]['metadata']['section_title']}")
     print(f"   Preview: {chunks[0]['text'][:100]}...")
 
-    return True
-
 
-def test_multi_pdf_indexing():
+def test_multi_pdf_indexing(rag):
     """Test 2: Multi-PDF indexing"""
     print("\n" + "="*80)
     print("TEST 2: Multi-PDF Indexing")
     print("="*80)
 
-    # Initialize RAG
-    rag = WellReportRAG()
-
     # Index all PDFs in Well 5
     result = rag.index_well_reports("Well 5", reindex=True)
 
@@ -88,32 +85,30 @@ def test_multi_pdf_indexing():
     if result['pdfs_skipped']:
         print(f"   Skipped: {', '.join(result['pdfs_skipped'])}")
 
-    return True
 
-
-def test_filtered_retrieval():
+def test_filtered_retrieval(rag):
     """Test 3: Filtered retrieval with chunk_type"""
     print("\n" + "="*80)
     print("TEST 3: Filtered Retrieval")
     print("="*80)
 
-    # Initialize RAG
-    rag = WellReportRAG()
-
     # Query embedding
     query = "casing inner diameter"
-    query_embedding = rag.embedding_manager.embed_text(query)
+    query_embedding = rag.embed_query(query)
 
-    # Test 1: Retrieve only table chunks
-    print("\n📊 Retrieving table chunks only...")
-    table_results = rag.vector_store.query_with_filters(
+    # One candidate search shared by all three filters
+    table_results, text_results, section_results = rag.vector_store.batch_query_with_filters(
         query_embedding=query_embedding,
-        well_name="Well 5",
-        chunk_types=['table'],
+        filters_list=[
+            {'well_name': "Well 5", 'chunk_types': ['table']},
+            {'well_name': "Well 5", 'chunk_types': ['text']},
+            {'well_name': "Well 5", 'section_types': ['casing']},
+        ],
         n_results=5
     )
 
-    # Validate
+    # Test 1: Retrieve only table chunks
+    print("\n📊 Retrieving table chunks only...")
     for meta in table_results['metadatas']:
         assert meta.get('chunk_type') == 'table', "Should only return table chunks"
 
@@ -121,14 +116,6 @@ def test_filtered_retrieval():
 
     # Test 2: Retrieve only text chunks
     print("\n📝 Retrieving text chunks only...")
-    text_results = rag.vector_store.query_with_filters(
-        query_embedding=query_embedding,
-        well_name="Well 5",
-        chunk_types=['text'],
-        n_results=5
-    )
-
-    # Validate
     for meta in text_results['metadatas']:
         assert meta.get('chunk_type') == 'text', "Should only return text chunks"
 
@@ -136,27 +123,18 @@ def test_filtered_retrieval():
 
     # Test 3: Retrieve from specific section types
     print("\n🎯 Retrieving casing sections only...")
-    section_results = rag.vector_store.query_with_filters(
-        query_embedding=query_embedding,
-        well_name="Well 5",
-        section_types=['casing'],
-        n_results=5
-    )
+    for meta in section_results['metadatas']:
+        assert meta.get('section_type') == 'casing', "Should only return casing sections"
 
     print(f"[OK] Section filtering working: {len(section_results['documents'])} chunks from casing sections")
 
-    return True
-
 
-def test_summarization():
+def test_summarization(rag):
     """Test 4: Summarization with word limits"""
     print("\n" + "="*80)
     print("TEST 4: Summarization")
     print("="*80)
 
-    # Initialize RAG
-    rag = WellReportRAG()
-
     # Initialize summarizer
     summarizer = ReportSummarizer(rag, max_words=200)
 
@@ -183,58 +161,3 @@ def test_summarization():
     print(f"   Sources used: {result['sources_used']} ({result['text_chunks_used']} text + {result['table_chunks_used']} tables)")
     print(f"   Focus sections: {', '.join(result['focus_sections'])}")
     print(f"   Word limit met: {result['word_limit_met']}")
-
-    return True
-
-
-def main():
-    """Run all integration tests"""
-    print("\n" + "="*80)
-    print("INTEGRATION TESTS - SUB-CHALLENGE 1")
-    print("="*80)
-
-    tests = [
-        ("Table Chunking", test_table_chunking),
-        ("Multi-PDF Indexing", test_multi_pdf_indexing),
-        ("Filtered Retrieval", test_filtered_retrieval),
-        ("Summarization", test_summarization),
-    ]
-
-    passed = 0
-    failed = 0
-
-    for name, test_func in tests:
-        try:
-            if test_func():
-                passed += 1
-        except Exception as e:
-            print(f"\n[FAIL] {name} FAILED: {e}")
-            import traceback
-            traceback.print_exc()
-            failed += 1
-
-    print("\n" + "="*80)
-    print("TEST RESULTS")
-    print("="*80)
-    print(f"[OK] Passed: {passed}/{len(tests)}")
-    print(f"[FAIL] Failed: {failed}/{len(tests)}")
-
-    if failed == 0:
-        print("\n🎉 ALL TESTS PASSED!")
-        print("\n[OK] Sub-Challenge 1 Components Validated:")
-        print("   • Table chunking with markdown format")
-        print("   • Multi-PDF indexing with document metadata")
-        print("   • Filtered retrieval (chunk_type, section_type)")
-        print("   • Summarization with word limit control")
-        print("\n📋 Next Steps:")
-        print("   1. Test on multiple wells")
-        print("   2. Optimize word limit accuracy")
-        print("   3. Create demo notebook (05_test_summarization.ipynb)")
-    else:
-        print("\n⚠️  Some tests failed. Review errors above.")
-
-    print("="*80)
-
-
-if __name__ == '__main__':
-    main()
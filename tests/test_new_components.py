@@ -7,7 +7,14 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-import pandas as pd
+# Heavy modules (pandas, chromadb, rag_system) are imported inside each test,
+# so running a single test only pays for what it uses
+
+
+def _param_names(func):
+    """Parameter names read straight from the code object (no inspect.Signature)"""
+    code = func.__code__
+    return code.co_varnames[:code.co_argcount + code.co_kwonlyargcount]
 
 
 def test_table_chunker():
@@ -16,6 +23,7 @@ def test_table_chunker():
     print("TEST 1: Table Chunker")
     print("="*80)
 
+    import pandas as pd
     from table_chunker import TableChunker
 
     # Mock table object
@@ -61,6 +69,31 @@ def test_table_chunker():
     assert 'Table: Casing Program' in chunks[0]['text'], "Caption should be in text"
     assert 'MD (m)' in chunks[0]['text'], "Table headers should be in text"
 
+    # A dict of columns renders exactly like the same data as a DataFrame
+    class DictTable:
+        def __init__(self, data, caption):
+            self.data = data
+            self.caption = caption
+            self.text = 'raw table text'
+
+    columns = {'MD (m)': [0, 500], 'Lithology': ['Clay', 'Sand']}
+    dict_chunks = chunker.chunk_tables(tables=[DictTable(columns, 'Casing Program')])
+    frame_chunks = chunker.chunk_tables(tables=[MockTable(columns, 'Casing Program', 20)])
+    assert dict_chunks[0]['text'] == frame_chunks[0]['text'], "dict and DataFrame tables should render the same"
+
+    # Malformed dicts fall back to the table text instead of raising
+    for bad in ({'a': 5}, {'a': [1, 2], 'b': [1]}):
+        bad_chunks = chunker.chunk_tables(tables=[DictTable(bad, 'Bad')])
+        assert bad_chunks[0]['text'] == 'Table: Bad\n\nraw table text', f"Fallback expected for {bad}"
+
+    # Tables that pandas hashes alike must not share a cached rendering
+    as_bytes = MockTable({'x': pd.Series(['a', b'x'], dtype=object)}, 'Cache', 1)
+    as_str = MockTable({'x': pd.Series(['a', 'x'], dtype=object)}, 'Cache', 1)
+    first = chunker.chunk_tables(tables=[as_bytes])
+    second = chunker.chunk_tables(tables=[as_str])
+    assert first[0]['text'] != second[0]['text'], "bytes and str cells should render differently"
+    assert second[0]['text'] == 'Table: Cache\n\n' + as_str.data.to_markdown(index=False)
+
     print("\n[OK] Table chunking working correctly")
     print(f"  Chunks created: {len(chunks)}")
     print(f"  Chunk type: {chunks[0]['metadata']['chunk_type']}")
@@ -72,38 +105,213 @@ def test_table_chunker():
     return True
 
 
+def _mock_vector_store(collection_name="test_filters"):
+    """
+    Vector store on a mocked ChromaDB HTTP client (no live server needed)
+
+    patch.dict keeps the mock client out of the process-wide client cache
+    used by later tests.
+    """
+    from unittest.mock import patch
+    from vector_store import TOCEnhancedVectorStore
+
+    with patch('vector_store.chromadb.HttpClient'), \
+         patch.dict('vector_store._CLIENTS', clear=True):
+        return TOCEnhancedVectorStore(
+            collection_name=collection_name,
+            chroma_host="localhost",
+            chroma_port=8000
+        )
+
+
 def test_vector_store_filters():
     """Test enhanced query_with_filters method"""
     print("\n" + "="*80)
     print("TEST 2: Vector Store Filtering")
     print("="*80)
 
-    from vector_store import TOCEnhancedVectorStore
-
-    # Create test vector store
-    vector_store = TOCEnhancedVectorStore(
-        collection_name="test_filters",
-        chroma_host="localhost",
-        chroma_port=8000
-    )
+    vector_store = _mock_vector_store()
 
     # Test that method exists and has correct signature
-    import inspect
-    sig = inspect.signature(vector_store.query_with_filters)
-    params = list(sig.parameters.keys())
+    params = _param_names(vector_store.query_with_filters)
 
     expected_params = ['query_embedding', 'well_name', 'section_types', 'chunk_types', 'document_names', 'n_results']
     for param in expected_params:
         assert param in params, f"Missing parameter: {param}"
 
     print("\n[OK] query_with_filters method exists with correct signature")
-    print(f"  Parameters: {', '.join(params)}")
+    print(f"  Parameters: {', '.join([p for p in params if p != 'self'])}")
+
+    return True
+
+
+def test_vector_store_query_batch_arrays():
+    """Test query_batch with a NumPy batch (as returned by embed_queries)"""
+    print("\n" + "="*80)
+    print("TEST 5: Vector Store Batch Query (NumPy)")
+    print("="*80)
+
+    import numpy as np
+
+    vector_store = _mock_vector_store()
+    vector_store.collection.query.return_value = {
+        'ids': [['a'], ['b']],
+        'documents': [['doc a'], ['doc b']],
+        'metadatas': [[{'well_name': 'Well 5'}], [{'well_name': 'Well 5'}]],
+        'distances': [[0.1], [0.2]],
+    }
+
+    results = vector_store.query_batch(np.ones((2, 4), dtype=np.float32), well_name="Well 5")
+
+    assert len(results) == 2, f"Expected 2 result sets, got {len(results)}"
+    assert results[0]['ids'] == ['a'] and results[1]['ids'] == ['b'], "Results out of order"
+    assert vector_store.query_batch(np.empty((0, 4), dtype=np.float32)) == [], "Empty batch should return []"
+
+    sent = vector_store.collection.query.call_args.kwargs['query_embeddings']
+    assert np.allclose(np.linalg.norm(sent, axis=1), 1.0), "Query vectors should be normalized"
+
+    print("\n[OK] query_batch accepts NumPy arrays")
+    print(f"  Result sets: {len(results)}")
+
+    return True
+
+
+def test_vector_store_metadata_types():
+    """Test add_documents metadata cleaning keeps numeric subclasses numeric"""
+    print("\n" + "="*80)
+    print("TEST 7: Vector Store Metadata Types")
+    print("="*80)
+
+    import enum
+    import numpy as np
+
+    class Priority(enum.IntEnum):
+        HIGH = 1
+
+    vector_store = _mock_vector_store()
+    vector_store.max_batch_size = 100  # normally read from the server
+    chunk = {
+        'text': 'Casing Program',
+        'embedding': np.ones(4, dtype=np.float32),
+        'metadata': {'depth': np.float64(2500.5), 'priority': Priority.HIGH,
+                     'page': None, 'tags': ['casing']},
+    }
+    vector_store.add_documents([chunk], "Well 5")
+
+    metadata = vector_store.collection.add.call_args.kwargs['metadatas'][0]
+    assert metadata['depth'] == 2500.5 and isinstance(metadata['depth'], float), "np.float64 should stay numeric"
+    assert metadata['priority'] == 1 and isinstance(metadata['priority'], int), "IntEnum should stay numeric"
+    assert metadata['page'] == "", "None should become an empty string"
+    assert metadata['tags'] == "['casing']", "Other types should be stringified"
+
+    print("\n[OK] Metadata cleaning keeps numeric values numeric")
+
+    return True
+
+
+class _InMemoryCollection:
+    """
+    Tiny stand-in for a ChromaDB collection: exact cosine search plus
+    equality/$in/$and where-filters, counting query() calls
+    """
+
+    def __init__(self, records):
+        import numpy as np
+        self.ids = [r[0] for r in records]
+        self.embeddings = np.array([r[1] for r in records], dtype=np.float32)
+        self.embeddings /= np.linalg.norm(self.embeddings, axis=1, keepdims=True)
+        self.metadatas = [r[2] for r in records]
+        self.query_calls = 0
+
+    def _matches(self, meta, where):
+        if not where:
+            return True
+        if '$and' in where:
+            return all(self._matches(meta, clause) for clause in where['$and'])
+        (field, cond), = where.items()
+        if isinstance(cond, dict):
+            return meta.get(field) in cond['$in']
+        return meta.get(field) == cond
+
+    def query(self, query_embeddings, n_results, where=None, include=None):
+        self.query_calls += 1
+        results = {'ids': [], 'documents': [], 'metadatas': [], 'distances': []}
+        for vector in query_embeddings:
+            distances = 1.0 - self.embeddings @ vector
+            ranked = [i for i in distances.argsort(kind='stable')
+                      if self._matches(self.metadatas[i], where)][:n_results]
+            results['ids'].append([self.ids[i] for i in ranked])
+            results['documents'].append([f"doc {self.ids[i]}" for i in ranked])
+            results['metadatas'].append([self.metadatas[i] for i in ranked])
+            results['distances'].append([float(distances[i]) for i in ranked])
+        return results
+
+
+def test_vector_store_batch_filters():
+    """Test batch_query_with_filters over-fetch and per-filter fallback"""
+    print("\n" + "="*80)
+    print("TEST 6: Vector Store Batched Filters")
+    print("="*80)
+
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    # 40 Well 5 chunks with a single rare table (t39), plus 10 Well 7 chunks
+    records = []
+    for i in range(40):
+        meta = {'well_name': 'Well 5',
+                'chunk_type': 'table' if i == 39 else 'text',
+                'section_type': 'casing' if i % 2 else 'depth'}
+        records.append((f"t{i}", rng.normal(size=8), meta))
+    for i in range(10):
+        records.append((f"w{i}", rng.normal(size=8),
+                        {'well_name': 'Well 7', 'chunk_type': 'text', 'section_type': 'casing'}))
+
+    vector_store = _mock_vector_store()
+    collection = _InMemoryCollection(records)
+    vector_store.collection = collection
+    query = rng.normal(size=8)
+
+    def check(filters_list, n_results, candidate_multiplier, expected_calls):
+        collection.query_calls = 0
+        batched = vector_store.batch_query_with_filters(
+            query, filters_list, n_results=n_results,
+            candidate_multiplier=candidate_multiplier
+        )
+        assert collection.query_calls == expected_calls, \
+            f"Expected {expected_calls} queries, got {collection.query_calls}"
+        for spec, result in zip(filters_list, batched):
+            expected = vector_store.query_with_filters(query, n_results=n_results, **spec)
+            assert result['ids'] == expected['ids'], f"Batched results differ for {spec}"
+            assert result['distances'] == expected['distances'], f"Batched distances differ for {spec}"
+        return batched
+
+    common = [
+        {'well_name': 'Well 5', 'chunk_types': ['text']},
+        {'well_name': 'Well 5', 'section_types': ['casing']},
+    ]
+
+    # Over-fetch: common filters are served from one candidate search
+    check(common, n_results=3, candidate_multiplier=4, expected_calls=1)
+
+    # Fallback: the rare table is outside a small, non-exhausted pool
+    batched = check(common + [{'well_name': 'Well 5', 'chunk_types': ['table']}],
+                    n_results=3, candidate_multiplier=1, expected_calls=2)
+    assert batched[2]['ids'] == ['t39'], "Fallback should find the rare table chunk"
+
+    # Exhausted pool: a short list is already complete, no fallback needed
+    check([{'well_name': 'Well 5', 'chunk_types': ['table']},
+           {'well_name': 'Well 5', 'section_types': ['depth']}],
+          n_results=30, candidate_multiplier=4, expected_calls=1)
+
+    # Mixed wells: one unrestricted candidate search, filtered per well
+    check([{'well_name': 'Well 5', 'section_types': ['casing']},
+           {'well_name': 'Well 7'}],
+          n_results=3, candidate_multiplier=10, expected_calls=1)
+
+    assert vector_store.batch_query_with_filters(query, []) == [], "No filters should return []"
 
-    # Clean up
-    try:
-        vector_store.client.delete_collection("test_filters")
-    except:
-        pass
+    print("\n[OK] batch_query_with_filters matches query_with_filters")
 
     return True
 
@@ -117,21 +325,18 @@ def test_summarizer_module():
     from summarizer import ReportSummarizer
 
     # Check class structure
-    import inspect
     methods = [m for m in dir(ReportSummarizer) if not m.startswith('_')]
 
     assert 'summarize' in dir(ReportSummarizer), "summarize method should exist"
 
     # Check init signature
-    init_sig = inspect.signature(ReportSummarizer.__init__)
-    init_params = list(init_sig.parameters.keys())
+    init_params = _param_names(ReportSummarizer.__init__)
 
     assert 'rag_system' in init_params, "Should accept rag_system parameter"
     assert 'max_words' in init_params, "Should accept max_words parameter"
 
     # Check summarize signature
-    summarize_sig = inspect.signature(ReportSummarizer.summarize)
-    summarize_params = list(summarize_sig.parameters.keys())
+    summarize_params = _param_names(ReportSummarizer.summarize)
 
     assert 'well_name' in summarize_params, "summarize should accept well_name"
     assert 'user_prompt' in summarize_params, "summarize should accept user_prompt"
@@ -153,13 +358,11 @@ def test_rag_enhancements():
 
     # Check that index_well_reports method exists
     from rag_system import WellReportRAG
-    import inspect
 
     assert hasattr(WellReportRAG, 'index_well_reports'), "index_well_reports method should exist"
 
     # Check signature
-    sig = inspect.signature(WellReportRAG.index_well_reports)
-    params = list(sig.parameters.keys())
+    params = _param_names(WellReportRAG.index_well_reports)
 
     assert 'well_name' in params, "Should accept well_name parameter"
     assert 'reindex' in params, "Should accept reindex parameter"
@@ -181,6 +384,9 @@ def main():
         ("Vector Store Filters", test_vector_store_filters),
         ("Summarizer Module", test_summarizer_module),
         ("RAG Enhancements", test_rag_enhancements),
+        ("Vector Store Batch Query", test_vector_store_query_batch_arrays),
+        ("Vector Store Batched Filters", test_vector_store_batch_filters),
+        ("Vector Store Metadata Types", test_vector_store_metadata_types),
     ]
 
     passed = 0